@@ -8,39 +8,336 @@ import sys
 from lxml import etree
 from pathlib import Path
 from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import chain, islice
 import argparse
+import gzip
+import html
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# XML catalog mapping external schema locations (e.g. xml.xsd) to local copies
+DEFAULT_CATALOG = Path(__file__).resolve().parent / 'catalog.xml'
+
+# File name patterns picked up by validate_directory, including compressed CCDs
+CCD_FILE_PATTERNS = ('*.xml', '*.xml.gz', '*.xml.zst')
+
+# Files larger than this are validated with iterparse so the tree is never
+# held in memory at once
+DEFAULT_STREAMING_THRESHOLD = 50 * 1024 * 1024
+
+# Parser settings for CCD documents: no external DTD or entity loading,
+# network access or ID table, none of which schema validation needs.
+# Internal entities are still expanded: with resolve_entities=False,
+# a schema-aware iterparse silently accepts some malformed documents.
+_PARSER_OPTIONS = {
+    'attribute_defaults': False,
+    'collect_ids': False,
+    'load_dtd': False,
+    'no_network': True,
+    'resolve_entities': 'internal',
+    'huge_tree': False
+}
+
+# Schema errors recorded per file before the rest are dropped
+DEFAULT_MAX_ERRORS = 100
+
+# Maximum number of files handed to a worker process per task
+WORKER_CHUNK_SIZE = 16
+
+
+@lru_cache(maxsize=None)
+def _compile_schema(xsd_path, mtime_ns):
+    """
+    Parse and compile an XSD schema, cached by path and modification time
+    
+    The mtime argument is only part of the cache key, so an edited schema
+    is recompiled on its next load.
+    """
+    return etree.XMLSchema(etree.parse(xsd_path))
+
+
+def _json_dumps(obj, indent=True):
+    """Serialize obj as JSON, using orjson when it is installed"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode('utf-8')
+    if indent:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(',', ':'))
+
+
+# HTML report fragments, filled in with str.format_map
+_HTML_HEADER_TMPL = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>CCD Validation Report</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; }}
+        .summary {{ background: #f0f0f0; padding: 15px; margin-bottom: 20px; }}
+        .file {{ border: 1px solid #ddd; margin: 10px 0; padding: 10px; }}
+        .valid {{ border-left: 5px solid #4CAF50; }}
+        .invalid {{ border-left: 5px solid #f44336; }}
+        .error {{ background: #ffebee; padding: 10px; margin: 5px 0; }}
+        .error-type {{ font-weight: bold; color: #c62828; }}
+        h1, h2 {{ color: #333; }}
+    </style>
+</head>
+<body>
+    <h1>CCD Validation Report</h1>
+    <div class="summary">
+        <p><strong>Generated:</strong> {generated}</p>
+        <p><strong>Total Files:</strong> {total}</p>
+        <p><strong>Valid:</strong> <span style="color: green;">{valid_count}</span></p>
+        <p><strong>Invalid:</strong> <span style="color: red;">{invalid_count}</span></p>
+    </div>
+"""
+
+# Valid files, usually the bulk of a report, get a single-line entry
+_HTML_VALID_FILE_TMPL = """
+    <div class="file valid"><strong>&#x2713; VALID:</strong> {path}</div>
+"""
+
+_HTML_FILE_TMPL = """
+    <div class="file {status_class}">
+        <h2>{name}</h2>
+        <p><strong>Status:</strong> {status_icon} {status_text}</p>
+        <p><strong>Path:</strong> {path}</p>
+"""
+
+_HTML_ERROR_TMPL = """
+        <div class="error">
+            <p><span class="error-type">Error #{number}: {type}</span>{location}</p>
+            <p>{message}</p>
+        </div>
+"""
+
+_HTML_ERRORS_HEADING = "        <h3>Errors:</h3>\n"
+
+_HTML_TRUNCATED = "        <p><em>Further errors omitted (error limit reached)</em></p>\n"
+
+_HTML_FILE_END = "    </div>\n"
+
+_HTML_FOOTER = """
+</body>
+</html>
+"""
+
+
+# Pre-serialized JSON for a valid result, matching _json_dumps(result,
+# indent=False) for the keys validate_file produces
+_JSON_VALID_RESULT_TMPL = (
+    '{"file":%s,"valid":true,"well_formed":true,"errors":[],"timestamp":%s}'
+)
+_JSON_VALID_RESULT_KEYS = ('file', 'valid', 'well_formed', 'errors', 'timestamp')
+
+
+# Per-process validate_file bound once by the worker pool initializer
+_worker_validate_file = None
+
+
+def _init_worker(xsd_path, streaming_threshold, catalog):
+    """Load the schema once in each worker process"""
+    global _worker_validate_file
+    validator = CCDValidator(
+        xsd_path,
+        quiet=True,
+        streaming_threshold=streaming_threshold,
+        catalog=catalog
+    )
+    _worker_validate_file = validator.validate_file
+
+
+def _open_ccd(ccd_path):
+    """
+    Open a CCD file for parsing, decompressing .gz and .zst files on the fly
+    
+    Args:
+        ccd_path: Path to the CCD XML file
+        
+    Returns:
+        Context manager yielding a source for etree.parse or etree.iterparse:
+        a decompressing file object, or the path itself for plain XML so
+        libxml2 can read it directly
+    """
+    name = str(ccd_path)
+    if name.endswith('.gz'):
+        return gzip.open(name, 'rb')
+    if name.endswith('.zst'):
+        if zstandard is None:
+            raise ImportError("The zstandard package is required to validate .zst files")
+        compressed = open(name, 'rb')
+        try:
+            return zstandard.ZstdDecompressor().stream_reader(compressed, closefd=True)
+        except BaseException:
+            compressed.close()
+            raise
+    return nullcontext(name)
+
+
+def _uncompressed_size(ccd_path):
+    """
+    Return the size of a CCD file's XML content in bytes
+    
+    For .gz files this is read from the gzip ISIZE trailer and for .zst
+    files from the frame header, so compressed files are compared against
+    the streaming threshold by the size they expand to. ISIZE only covers
+    the last member of a multi-member gzip file (e.g. one built by
+    concatenating .gz files), so such a file can be undercounted and
+    parsed into a full tree despite being over the threshold.
+    
+    Args:
+        ccd_path: Path to the CCD XML file
+        
+    Returns:
+        int: Uncompressed size, or float('inf') when it cannot be determined
+        
+    Raises:
+        gzip.BadGzipFile: A .gz file is too short to hold a gzip header
+            and trailer
+    """
+    name = str(ccd_path)
+    size = os.path.getsize(name)
+    if name.endswith('.gz'):
+        # 10-byte header plus 8-byte trailer
+        if size < 18:
+            raise gzip.BadGzipFile(f"Truncated or not a gzip file: {ccd_path}")
+        with open(name, 'rb') as compressed:
+            compressed.seek(-4, os.SEEK_END)
+            isize = int.from_bytes(compressed.read(4), 'little')
+        # ISIZE is stored modulo 2**32; an expanded size smaller than the
+        # compressed one means it wrapped
+        return isize if isize >= size else float('inf')
+    if name.endswith('.zst') and zstandard is not None:
+        with open(name, 'rb') as compressed:
+            # A Zstandard frame header is at most 18 bytes
+            content_size = zstandard.frame_content_size(compressed.read(18))
+        # -1 means the frame header does not record the content size
+        return content_size if content_size >= 0 else float('inf')
+    return size
+
+
+def _drain_iterparse(context):
+    """
+    Consume an iterparse context, discarding each subtree once it is parsed
+    
+    Args:
+        context: etree.iterparse context created with events=('end',)
+    """
+    for _, elem in context:
+        elem.clear(keep_tail=True)
+        # Drop finished siblings so only the current ancestor chain remains
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+def _add_schema_errors(result, error_log, max_errors):
+    """
+    Append schema errors from an lxml error log to a result dict
+    
+    Args:
+        result: Validation result dict to update
+        error_log: lxml error log holding the schema errors
+        max_errors: Maximum number of errors to record (None or <= 0 for
+            no limit)
+    """
+    if max_errors is None or max_errors <= 0:
+        errors = error_log
+    else:
+        errors = islice(error_log, max_errors)
+        if len(error_log) > max_errors:
+            result['errors_truncated'] = True
+    # Built inline in one comprehension: this runs once per schema error
+    result['errors'].extend([
+        {
+            'type': 'SCHEMA_VALIDATION_ERROR',
+            'message': error.message,
+            'line': error.line,
+            'column': error.column,
+            'domain': error.domain_name,
+            'level': error.level_name
+        }
+        for error in errors
+    ])
+
+
+def _validate_chunk_in_worker(ccd_paths, max_errors, timestamp):
+    """Validate a chunk of files using the worker's validator"""
+    validate_file = _worker_validate_file
+    return [validate_file(path, max_errors, timestamp) for path in ccd_paths]
+
 
 class CCDValidator:
-    def __init__(self, xsd_path):
+    def __init__(self, xsd_path, quiet=False,
+                 streaming_threshold=DEFAULT_STREAMING_THRESHOLD, catalog=None):
         """
         Initialize the validator with the main XSD schema file
         
         Args:
             xsd_path: Path to the main CDA.xsd or POCD_MT000040.xsd file
+            quiet: Suppress informational console output
+            streaming_threshold: File size in bytes above which files are
+                validated with validate_file_streaming
+            catalog: XML catalog used to resolve schema imports
+                (default: the catalog.xml shipped with this script)
         """
         self.xsd_path = Path(xsd_path)
+        self.quiet = quiet
+        self.streaming_threshold = streaming_threshold
+        self.catalog = Path(catalog) if catalog else DEFAULT_CATALOG
         self.schema = None
+        self.parser = None
         self.load_schema()
     
     def load_schema(self):
         """Load the XSD schema for validation"""
         try:
-            with open(self.xsd_path, 'rb') as schema_file:
-                schema_doc = etree.parse(schema_file)
-                self.schema = etree.XMLSchema(schema_doc)
-            print(f"✓ Schema loaded successfully from: {self.xsd_path}")
+            # libxml2 reads the catalog list the first time it resolves an
+            # external resource, so this must happen before any schema load.
+            # Catalogs the user already configured stay in the list.
+            catalog_uri = self.catalog.resolve().as_uri()
+            catalogs = os.environ.get('XML_CATALOG_FILES', '').split()
+            if catalog_uri not in catalogs:
+                os.environ['XML_CATALOG_FILES'] = ' '.join([catalog_uri] + catalogs)
+            self.schema = _compile_schema(
+                str(self.xsd_path.resolve()),
+                self.xsd_path.stat().st_mtime_ns
+            )
+            # Parser reused for every file; its error_log is reset on each
+            # parse. Like any XMLParser it must not be shared between threads.
+            self.parser = etree.XMLParser(**_PARSER_OPTIONS)
+            if not self.quiet:
+                print(f"✓ Schema loaded successfully from: {self.xsd_path}")
         except Exception as e:
             print(f"✗ Error loading schema: {e}")
             sys.exit(1)
     
-    def validate_file(self, ccd_path):
+    def validate_file(self, ccd_path, max_errors=DEFAULT_MAX_ERRORS, timestamp=None):
         """
         Validate a single CCD file against the schema
         
         Args:
-            ccd_path: Path to the CCD XML file
+            ccd_path: Path to the CCD XML file, optionally .gz or .zst compressed
+            max_errors: Maximum number of schema errors to record (None or
+                <= 0 for no limit); further errors are dropped and
+                'errors_truncated' is set
+            timestamp: ISO timestamp to record (default: current time)
             
         Returns:
             dict: Validation results with status and errors
@@ -50,38 +347,79 @@ class CCDValidator:
             'valid': False,
             'well_formed': False,
             'errors': [],
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp or datetime.now().isoformat()
         }
         
         try:
+            if _uncompressed_size(ccd_path) > self.streaming_threshold:
+                self._stream_validate(ccd_path, result, max_errors)
+                return result
+            
             # First check if XML is well-formed
-            with open(ccd_path, 'rb') as xml_file:
-                try:
-                    doc = etree.parse(xml_file)
-                    result['well_formed'] = True
-                except etree.XMLSyntaxError as e:
-                    result['errors'].append({
-                        'type': 'XML_SYNTAX_ERROR',
-                        'message': str(e),
-                        'line': e.lineno if hasattr(e, 'lineno') else None
-                    })
-                    return result
+            try:
+                with _open_ccd(ccd_path) as source:
+                    doc = etree.parse(source, self.parser)
+                result['well_formed'] = True
+            except etree.XMLSyntaxError as e:
+                result['errors'].append({
+                    'type': 'XML_SYNTAX_ERROR',
+                    'message': str(e),
+                    'line': e.lineno if hasattr(e, 'lineno') else None
+                })
+                return result
             
-            # Validate against schema
+            # Validate the parsed tree. A schema-aware XMLParser would save
+            # this second walk, but libxml2 does not check xs:ID uniqueness
+            # when validating while parsing, so duplicate IDs would pass.
             if self.schema.validate(doc):
                 result['valid'] = True
             else:
-                # Collect all validation errors
-                for error in self.schema.error_log:
-                    result['errors'].append({
-                        'type': 'SCHEMA_VALIDATION_ERROR',
-                        'message': error.message,
-                        'line': error.line,
-                        'column': error.column,
-                        'domain': error.domain_name,
-                        'level': error.level_name
-                    })
+                # Collect validation errors up to the limit
+                _add_schema_errors(result, self.schema.error_log, max_errors)
+        
+        except FileNotFoundError:
+            result['errors'].append({
+                'type': 'FILE_NOT_FOUND',
+                'message': f"File not found: {ccd_path}"
+            })
+        except Exception as e:
+            result['errors'].append({
+                'type': 'UNEXPECTED_ERROR',
+                'message': str(e)
+            })
+        
+        return result
+    
+    def validate_file_streaming(self, ccd_path, max_errors=DEFAULT_MAX_ERRORS,
+                                timestamp=None):
+        """
+        Validate a large CCD file without building the full document tree
+        
+        Elements are discarded as soon as they have been parsed, so memory
+        use depends on document depth rather than size. Schema errors from
+        the streaming validator carry no line numbers, and xs:ID uniqueness
+        is not checked: a file with duplicate IDs (e.g. repeated narrative
+        content IDs) can pass here while validate_file rejects it.
         
+        Args:
+            ccd_path: Path to the CCD XML file, optionally .gz or .zst compressed
+            max_errors: Maximum number of schema errors to record (None or
+                <= 0 for no limit)
+            timestamp: ISO timestamp to record (default: current time)
+            
+        Returns:
+            dict: Validation results with status and errors
+        """
+        result = {
+            'file': str(ccd_path),
+            'valid': False,
+            'well_formed': False,
+            'errors': [],
+            'timestamp': timestamp or datetime.now().isoformat()
+        }
+        
+        try:
+            self._stream_validate(ccd_path, result, max_errors)
         except FileNotFoundError:
             result['errors'].append({
                 'type': 'FILE_NOT_FOUND',
@@ -95,13 +433,68 @@ class CCDValidator:
         
         return result
     
-    def validate_directory(self, directory_path, recursive=False):
+    def _stream_validate(self, ccd_path, result, max_errors):
+        """
+        Populate result by validating ccd_path with iterparse
+        
+        Args:
+            ccd_path: Path to the CCD XML file
+            result: Validation result dict to update
+            max_errors: Maximum number of schema errors to record
+        """
+        with _open_ccd(ccd_path) as source:
+            context = etree.iterparse(
+                source,
+                events=('end',),
+                schema=self.schema,
+                **_PARSER_OPTIONS
+            )
+            try:
+                _drain_iterparse(context)
+                result['well_formed'] = True
+                result['valid'] = True
+                return
+            except etree.XMLSyntaxError:
+                schema_errors = context.error_log
+        
+        # The streaming validator can hide a syntax error behind an earlier
+        # schema error, so check well-formedness in a second streaming pass
+        try:
+            with _open_ccd(ccd_path) as source:
+                _drain_iterparse(
+                    etree.iterparse(source, events=('end',), **_PARSER_OPTIONS)
+                )
+            result['well_formed'] = True
+        except etree.XMLSyntaxError as e:
+            result['errors'].append({
+                'type': 'XML_SYNTAX_ERROR',
+                'message': str(e),
+                'line': e.lineno if hasattr(e, 'lineno') else None
+            })
+            return
+        
+        _add_schema_errors(result, schema_errors, max_errors)
+        for entry in result['errors']:
+            entry['line'] = entry['line'] or None
+            entry['column'] = entry['column'] or None
+    
+    def validate_directory(self, directory_path, recursive=False, jobs=None,
+                           max_errors=DEFAULT_MAX_ERRORS, progress=False):
         """
         Validate all XML/CCD files in a directory
         
+        Files are validated in parallel across a pool of worker processes,
+        each of which loads the schema once. The directory is scanned lazily,
+        so validation starts as soon as the first files are found. Gzip
+        (.xml.gz) and Zstandard (.xml.zst) compressed files are included.
+        
         Args:
             directory_path: Path to directory containing CCD files
             recursive: Whether to search subdirectories
+            jobs: Number of worker processes (default: number of CPUs)
+            max_errors: Maximum number of schema errors to record per file
+            progress: Count the files up front and show [n/total] progress
+                (ignored when the validator is quiet)
             
         Returns:
             list: List of validation results for all files
@@ -109,152 +502,233 @@ class CCDValidator:
         results = []
         directory = Path(directory_path)
         
-        # Find all XML files
-        pattern = '**/*.xml' if recursive else '*.xml'
-        xml_files = list(directory.glob(pattern))
+        # Find all XML files, plain or compressed
+        patterns = [
+            f'**/{pattern}' if recursive else pattern
+            for pattern in CCD_FILE_PATTERNS
+        ]
+        xml_files = chain.from_iterable(directory.glob(p) for p in patterns)
         
-        if not xml_files:
+        # Peek at the first two files to decide whether a pool is worthwhile
+        first_files = list(islice(xml_files, 2))
+        if not first_files:
             print(f"No XML files found in {directory_path}")
             return results
+        xml_files = chain(first_files, xml_files)
+        
+        # The counting scan is only worth it when progress lines are shown
+        progress = progress and not self.quiet
+        if progress:
+            total = sum(1 for p in patterns for _ in directory.glob(p))
+            print(f"\nValidating {total} file(s)...\n")
+        elif not self.quiet:
+            print(f"\nValidating files in {directory_path}...\n")
         
-        print(f"\nValidating {len(xml_files)} file(s)...\n")
+        # One timestamp for the whole batch rather than one per file
+        timestamp = datetime.now().isoformat()
+        
+        jobs = jobs or os.cpu_count() or 1
+        if jobs > 1 and len(first_files) > 1:
+            validated = self._validate_in_pool(xml_files, jobs, max_errors, timestamp)
+        else:
+            validate_file = self.validate_file
+            validated = (
+                validate_file(path, max_errors, timestamp) for path in xml_files
+            )
         
-        for xml_file in xml_files:
-            print(f"Validating: {xml_file.name}... ", end='')
-            result = self.validate_file(xml_file)
+        for count, result in enumerate(validated, 1):
+            results.append(result)
+            if self.quiet:
+                continue
             
             if result['valid']:
-                print("✓ VALID")
+                status = "✓ VALID"
             elif result['well_formed']:
-                print(f"✗ INVALID ({len(result['errors'])} errors)")
+                status = f"✗ INVALID ({len(result['errors'])} errors)"
             else:
-                print("✗ NOT WELL-FORMED")
+                status = "✗ NOT WELL-FORMED"
             
-            results.append(result)
+            # One write per file; stdout buffering decides when to flush
+            prefix = f"[{count}/{total}] " if progress else ""
+            sys.stdout.write(f"{prefix}Validating: {Path(result['file']).name}... {status}\n")
         
+        sys.stdout.flush()
         return results
     
+    def _validate_in_pool(self, xml_files, jobs, max_errors, timestamp):
+        """
+        Validate files across worker processes, yielding results in order
+        
+        Files are submitted in chunks as they are read from xml_files, with
+        a bounded number of chunks in flight, so the file list is never
+        materialized. The first files go out one per task so that even a
+        small directory is spread across every worker; chunks then grow
+        towards WORKER_CHUNK_SIZE as more files are seen.
+        
+        Args:
+            xml_files: Iterable of paths to validate
+            jobs: Number of worker processes
+            max_errors: Maximum number of schema errors to record per file
+            timestamp: ISO timestamp recorded on every result
+            
+        Yields:
+            dict: Validation result for each file, in input order
+        """
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(str(self.xsd_path), self.streaming_threshold, str(self.catalog))
+        ) as executor:
+            pending = deque()
+            submitted = 0
+            while True:
+                chunk_size = min(WORKER_CHUNK_SIZE, max(1, submitted // jobs))
+                chunk = list(islice(xml_files, chunk_size))
+                if not chunk:
+                    break
+                submitted += len(chunk)
+                pending.append(
+                    executor.submit(
+                        _validate_chunk_in_worker, chunk, max_errors, timestamp
+                    )
+                )
+                # Keep every worker busy without queueing the whole directory
+                if len(pending) > 2 * jobs:
+                    yield from pending.popleft().result()
+            
+            while pending:
+                yield from pending.popleft().result()
+    
     def generate_report(self, results, output_format='text', output_file=None):
         """
         Generate a validation report
         
+        The report is written incrementally, one file result at a time,
+        rather than being assembled in memory first.
+        
         Args:
             results: List of validation results
             output_format: 'text', 'json', or 'html'
-            output_file: Optional output file path
+            output_file: Optional output file path (default: print to console)
         """
         if output_format == 'json':
-            report = self._generate_json_report(results)
+            write_report = self._write_json_report
         elif output_format == 'html':
-            report = self._generate_html_report(results)
+            write_report = self._write_html_report
         else:
-            report = self._generate_text_report(results)
+            write_report = self._write_text_report
+        
+        # Count once here rather than in each report writer
+        valid_count = sum(1 for r in results if r['valid'])
+        invalid_count = len(results) - valid_count
         
         if output_file:
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(report)
+                write_report(results, f, valid_count, invalid_count)
             print(f"\nReport saved to: {output_file}")
         else:
-            print(report)
-        
-        return report
+            write_report(results, sys.stdout, valid_count, invalid_count)
+            sys.stdout.flush()
     
-    def _generate_text_report(self, results):
-        """Generate a text format report"""
+    def _write_text_report(self, results, out, valid_count, invalid_count):
+        """Write a text format report to the file object out"""
         lines = []
         lines.append("=" * 80)
         lines.append("CCD VALIDATION REPORT")
         lines.append("=" * 80)
         lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         lines.append(f"Total files validated: {len(results)}")
-        
-        valid_count = sum(1 for r in results if r['valid'])
-        invalid_count = len(results) - valid_count
-        
         lines.append(f"Valid: {valid_count}")
         lines.append(f"Invalid: {invalid_count}")
         lines.append("=" * 80)
         lines.append("")
+        out.write("\n".join(lines))
         
+        after_invalid = False
         for result in results:
+            # Valid files get one line; the detailed block is for failures
+            if result['valid']:
+                # Keep a blank line between an invalid block and the next entry
+                separator = "\n\n" if after_invalid else "\n"
+                out.write(f"{separator}✓ VALID: {result['file']}")
+                after_invalid = False
+                continue
+            after_invalid = True
+            
+            lines = [""]
             lines.append(f"\nFile: {result['file']}")
             lines.append("-" * 80)
+            lines.append(f"Status: ✗ INVALID ({len(result['errors'])} errors)")
+            lines.append("\nErrors:")
             
-            if result['valid']:
-                lines.append("Status: ✓ VALID")
-            else:
-                lines.append(f"Status: ✗ INVALID ({len(result['errors'])} errors)")
-                lines.append("\nErrors:")
-                
-                for i, error in enumerate(result['errors'], 1):
-                    lines.append(f"\n  Error #{i}:")
-                    lines.append(f"    Type: {error['type']}")
-                    lines.append(f"    Message: {error['message']}")
-                    if error.get('line'):
-                        lines.append(f"    Line: {error['line']}")
-                    if error.get('column'):
-                        lines.append(f"    Column: {error['column']}")
+            for i, error in enumerate(result['errors'], 1):
+                lines.append(f"\n  Error #{i}:")
+                lines.append(f"    Type: {error['type']}")
+                lines.append(f"    Message: {error['message']}")
+                if error.get('line'):
+                    lines.append(f"    Line: {error['line']}")
+                if error.get('column'):
+                    lines.append(f"    Column: {error['column']}")
+            
+            if result.get('errors_truncated'):
+                lines.append("\n  Further errors omitted (error limit reached)")
+            
+            out.write("\n".join(lines))
         
-        return "\n".join(lines)
+        out.write("\n")
     
-    def _generate_json_report(self, results):
-        """Generate a JSON format report"""
-        report = {
-            'generated': datetime.now().isoformat(),
-            'summary': {
-                'total': len(results),
-                'valid': sum(1 for r in results if r['valid']),
-                'invalid': sum(1 for r in results if not r['valid'])
-            },
-            'results': results
+    def _write_json_report(self, results, out, valid_count, invalid_count):
+        """Write a JSON format report to the file object out"""
+        summary = {
+            'total': len(results),
+            'valid': valid_count,
+            'invalid': invalid_count
         }
-        return json.dumps(report, indent=2)
-    
-    def _generate_html_report(self, results):
-        """Generate an HTML format report"""
-        valid_count = sum(1 for r in results if r['valid'])
-        invalid_count = len(results) - valid_count
+        out.write('{\n')
+        out.write(f'  "generated": {_json_dumps(datetime.now().isoformat())},\n')
+        out.write(f'  "summary": {_json_dumps(summary, indent=False)},\n')
+        out.write('  "results": [')
         
-        html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>CCD Validation Report</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; }}
-        .summary {{ background: #f0f0f0; padding: 15px; margin-bottom: 20px; }}
-        .file {{ border: 1px solid #ddd; margin: 10px 0; padding: 10px; }}
-        .valid {{ border-left: 5px solid #4CAF50; }}
-        .invalid {{ border-left: 5px solid #f44336; }}
-        .error {{ background: #ffebee; padding: 10px; margin: 5px 0; }}
-        .error-type {{ font-weight: bold; color: #c62828; }}
-        h1, h2 {{ color: #333; }}
-    </style>
-</head>
-<body>
-    <h1>CCD Validation Report</h1>
-    <div class="summary">
-        <p><strong>Generated:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        <p><strong>Total Files:</strong> {len(results)}</p>
-        <p><strong>Valid:</strong> <span style="color: green;">{valid_count}</span></p>
-        <p><strong>Invalid:</strong> <span style="color: red;">{invalid_count}</span></p>
-    </div>
-"""
+        separator = '\n    '
+        for result in results:
+            out.write(separator)
+            if result['valid'] and tuple(result) == _JSON_VALID_RESULT_KEYS:
+                out.write(_JSON_VALID_RESULT_TMPL % (
+                    _json_dumps(result['file'], indent=False),
+                    _json_dumps(result['timestamp'], indent=False)
+                ))
+            else:
+                out.write(_json_dumps(result, indent=False))
+            separator = ',\n    '
+        
+        out.write('\n  ]\n}\n')
+    
+    def _write_html_report(self, results, out, valid_count, invalid_count):
+        """Write an HTML format report to the file object out"""
+        out.write(_HTML_HEADER_TMPL.format_map({
+            'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'total': len(results),
+            'valid_count': valid_count,
+            'invalid_count': invalid_count
+        }))
         
         for result in results:
-            status_class = 'valid' if result['valid'] else 'invalid'
-            status_text = 'VALID' if result['valid'] else f'INVALID ({len(result["errors"])} errors)'
-            status_icon = '&#x2713;' if result['valid'] else '&#x2717;'
+            if result['valid']:
+                out.write(_HTML_VALID_FILE_TMPL.format_map({
+                    'path': html.escape(result['file'], quote=False)
+                }))
+                continue
             
-            html += f"""
-    <div class="file {status_class}">
-        <h2>{Path(result['file']).name}</h2>
-        <p><strong>Status:</strong> {status_icon} {status_text}</p>
-        <p><strong>Path:</strong> {result['file']}</p>
-"""
+            parts = [_HTML_FILE_TMPL.format_map({
+                'status_class': 'invalid',
+                'name': html.escape(Path(result['file']).name, quote=False),
+                'status_icon': '&#x2717;',
+                'status_text': f'INVALID ({len(result["errors"])} errors)',
+                'path': html.escape(result['file'], quote=False)
+            })]
             
             if result['errors']:
-                html += "        <h3>Errors:</h3>\n"
+                parts.append(_HTML_ERRORS_HEADING)
                 for i, error in enumerate(result['errors'], 1):
                     location = ""
                     if error.get('line'):
@@ -263,20 +737,31 @@ class CCDValidator:
                             location += f", Column {error['column']}"
                         location += ")"
                     
-                    html += f"""
-        <div class="error">
-            <p><span class="error-type">Error #{i}: {error['type']}</span>{location}</p>
-            <p>{error['message']}</p>
-        </div>
-"""
+                    parts.append(_HTML_ERROR_TMPL.format_map({
+                        'number': i,
+                        'type': html.escape(error['type'], quote=False),
+                        'location': location,
+                        'message': html.escape(error['message'], quote=False)
+                    }))
             
-            html += "    </div>\n"
-        
-        html += """
-</body>
-</html>"""
+            if result.get('errors_truncated'):
+                parts.append(_HTML_TRUNCATED)
+            
+            parts.append(_HTML_FILE_END)
+            out.write(''.join(parts))
         
-        return html
+        out.write(_HTML_FOOTER)
+
+
+def _non_negative_int(value):
+    """argparse type for integer options that must not be negative"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or greater, got {number}")
+    return number
 
 
 def main():
@@ -291,6 +776,9 @@ Examples:
   # Validate all files in a directory
   python ccd_validator.py --xsd CDA.xsd --dir ./ccd_files
   
+  # Validate a directory using 4 worker processes
+  python ccd_validator.py --xsd CDA.xsd --dir ./ccd_files --jobs 4
+  
   # Validate recursively and save HTML report
   python ccd_validator.py --xsd CDA.xsd --dir ./ccd_files --recursive --format html --output report.html
         """
@@ -303,6 +791,22 @@ Examples:
     parser.add_argument('--format', choices=['text', 'json', 'html'], default='text', 
                         help='Output format (default: text)')
     parser.add_argument('--output', help='Output file path (default: print to console)')
+    parser.add_argument('--catalog',
+                        help='XML catalog for resolving schema imports locally '
+                             '(default: catalog.xml next to this script)')
+    parser.add_argument('--stream-threshold', type=float, default=None, metavar='MB',
+                        help='Validate files larger than this many MB without loading '
+                             'them fully into memory; duplicate xs:ID values are not '
+                             'detected in such files (default: 50)')
+    parser.add_argument('--max-errors', type=_non_negative_int, default=DEFAULT_MAX_ERRORS,
+                        help='Maximum schema errors to report per file, 0 for no limit '
+                             f'(default: {DEFAULT_MAX_ERRORS})')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Do not print per-file progress')
+    parser.add_argument('--progress', action='store_true',
+                        help='Count files before validating and show progress')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Number of worker processes for --dir (default: number of CPUs)')
     
     args = parser.parse_args()
     
@@ -310,13 +814,25 @@ Examples:
         parser.error('Either --file or --dir must be specified')
     
     # Create validator
-    validator = CCDValidator(args.xsd)
+    if args.stream_threshold is None:
+        streaming_threshold = DEFAULT_STREAMING_THRESHOLD
+    else:
+        streaming_threshold = int(args.stream_threshold * 1024 * 1024)
+    validator = CCDValidator(
+        args.xsd,
+        quiet=args.quiet,
+        streaming_threshold=streaming_threshold,
+        catalog=args.catalog
+    )
     
     # Validate files
+    max_errors = args.max_errors or None
     if args.file:
-        results = [validator.validate_file(args.file)]
+        results = [validator.validate_file(args.file, max_errors)]
     else:
-        results = validator.validate_directory(args.dir, args.recursive)
+        results = validator.validate_directory(
+            args.dir, args.recursive, args.jobs, max_errors, args.progress
+        )
     
     # Generate report
     validator.generate_report(results, args.format, args.output)
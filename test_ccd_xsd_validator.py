@@ -0,0 +1,57 @@
+"""
+Regression checks for ccd_xsd_validator
+
+Run with: python -m unittest test_ccd_xsd_validator
+"""
+
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+from ccd_xsd_validator import CCDValidator
+
+REPO_DIR = Path(__file__).resolve().parent
+XSD_PATH = REPO_DIR / 'CDA-core-2.0-master/schema/extensions/SDTC/infrastructure/cda/CDA_SDTC.xsd'
+SAMPLE_CCD = REPO_DIR / 'CDA-core-2.0-master/examples/sampleCCD.xml'
+
+
+class DuplicateIdTest(unittest.TestCase):
+    """Duplicate xs:ID values must make a file invalid"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.validator = CCDValidator(XSD_PATH, quiet=True)
+        cls.tmpdir = tempfile.TemporaryDirectory()
+
+        # Repeating the structuredBody components duplicates narrative IDs
+        # such as <content ID="product1">
+        source = SAMPLE_CCD.read_text(encoding='utf-8')
+        match = re.search(r'(<structuredBody[^>]*>)(.*)(</structuredBody>)', source, re.S)
+        duplicated = (
+            source[:match.start()] + match.group(1) + match.group(2) * 3
+            + match.group(3) + source[match.end():]
+        )
+        cls.dup_path = Path(cls.tmpdir.name) / 'dup.xml'
+        cls.dup_path.write_text(duplicated, encoding='utf-8')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_sample_is_valid(self):
+        result = self.validator.validate_file(SAMPLE_CCD)
+        self.assertTrue(result['valid'], result['errors'])
+
+    def test_duplicate_ids_are_invalid(self):
+        result = self.validator.validate_file(self.dup_path, max_errors=None)
+        self.assertTrue(result['well_formed'])
+        self.assertFalse(result['valid'])
+        self.assertTrue(any(
+            "'product1' is not a valid value of the atomic type 'xs:ID'" in error['message']
+            for error in result['errors']
+        ))
+
+
+if __name__ == '__main__':
+    unittest.main()